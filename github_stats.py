@@ -1,32 +1,136 @@
 import os
 import getpass
-import requests
+import argparse
+import math
+import time
+import asyncio
+import httpx
+import diskcache
+import numpy as np
+import orjson
+from collections import Counter
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice
 from rich.console import Console
-from rich.progress import Progress, track
+from rich.progress import Progress
 from rich.panel import Panel
 from rich.text import Text
 from dotenv import load_dotenv
-from concurrent.futures import ThreadPoolExecutor
-from itertools import repeat
 
 load_dotenv()
 
 GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+COMMIT_STATS_CACHE_DIR = os.path.expanduser("~/.cache/gh-stats")
+# Bumped when earlier cached entries can no longer be trusted (v1 could hold zeros for repos that errored)
+COMMIT_STATS_CACHE_VERSION = 2
 
-def graphql_request(query, variables, token):
-    """Executes a GraphQL query to the GitHub API."""
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.post(
-        GITHUB_GRAPHQL_URL,
-        json={"query": query, "variables": variables},
-        headers=headers,
+MAX_REQUEST_ATTEMPTS = 5
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+RATE_LIMIT_LOW_WATERMARK = 50
+
+def get_retry_delay(response, data, attempt):
+    """Returns how long to wait before retrying a response, or None if it should not be retried."""
+    status = response.status_code
+    # GraphQL reports an exhausted primary rate limit as 200 with a RATE_LIMITED error
+    graphql_rate_limited = data is not None and any(
+        error.get("type") == "RATE_LIMITED" for error in data.get("errors") or ()
     )
-    response.raise_for_status()
-    return response.json()
+    if status not in RETRY_STATUS_CODES and status != 403 and not graphql_rate_limited:
+        return None
+
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        return float(retry_after)
+    reset = response.headers.get("X-RateLimit-Reset")
+    if response.headers.get("X-RateLimit-Remaining") == "0" and reset is not None:
+        return max(0, int(reset) - time.time())
+    # Any other 403 is a genuine permission error
+    if status == 403:
+        return None
+    return 2 ** attempt
+
+def build_rate_limit_hooks(console):
+    """Builds httpx event hooks that hold back requests while the rate limit window is nearly exhausted."""
+    rate_limit = {"remaining": math.inf, "reset": 0, "announced_reset": None}
+
+    async def record_rate_limit(response):
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        remaining, reset = int(remaining), int(reset)
+        # Responses can arrive out of order; keep the lowest count seen for the newest window
+        if reset > rate_limit["reset"] or (reset == rate_limit["reset"] and remaining < rate_limit["remaining"]):
+            rate_limit.update(remaining=remaining, reset=reset)
+
+        # Several in-flight batches can see the same low count; announce each window only once
+        if remaining < RATE_LIMIT_LOW_WATERMARK and rate_limit["announced_reset"] != reset:
+            rate_limit["announced_reset"] = reset
+            console.print(
+                f"[yellow]GitHub API rate limit nearly exhausted ({remaining} requests left). "
+                f"Waiting until {datetime.fromtimestamp(reset).strftime('%H:%M:%S')} for it to reset...[/yellow]"
+            )
+
+    async def wait_for_rate_limit(request):
+        if rate_limit["remaining"] < RATE_LIMIT_LOW_WATERMARK:
+            await asyncio.sleep(max(0, rate_limit["reset"] - time.time()))
+
+    return {"request": [wait_for_rate_limit], "response": [record_rate_limit]}
+
+async def graphql_request(client, query, variables):
+    """Executes a GraphQL query to the GitHub API, retrying transient failures with backoff."""
+    for attempt in range(MAX_REQUEST_ATTEMPTS):
+        is_last_attempt = attempt == MAX_REQUEST_ATTEMPTS - 1
+        try:
+            response = await client.post(
+                GITHUB_GRAPHQL_URL,
+                content=orjson.dumps({"query": query, "variables": variables}),
+            )
+        except httpx.TransportError:
+            if is_last_attempt:
+                raise
+            await asyncio.sleep(2 ** attempt)
+            continue
+
+        data = orjson.loads(response.content) if response.is_success else None
+        retry_delay = get_retry_delay(response, data, attempt)
+        if retry_delay is not None and not is_last_attempt:
+            await asyncio.sleep(retry_delay)
+            continue
+        response.raise_for_status()
+
+        if data.get("data") is None and data.get("errors"):
+            raise RuntimeError(data["errors"][0].get("message", "GraphQL request failed"))
+        return data
+
+REPOSITORY_FIELDS_FRAGMENT = """
+fragment RepositoryFields on Repository {
+  name
+  owner {
+    login
+  }
+  stargazerCount
+  forkCount
+  defaultBranchRef {
+    target {
+      oid
+    }
+  }
+  languages(first: 10, orderBy: {field: SIZE, direction: DESC}) {
+    edges {
+      size
+      node {
+        name
+        color
+      }
+    }
+  }
+}
+"""
 
-GET_USER_SUMMARY_QUERY = """
-query GetUserSummary($username: String!) {
+GET_USER_BOOTSTRAP_QUERY = """
+query GetUserBootstrap($username: String!) {
   user(login: $username) {
     id
     createdAt
@@ -36,8 +140,15 @@ query GetUserSummary($username: String!) {
     following {
       totalCount
     }
-    repositories(ownerAffiliations: OWNER, isFork: false, privacy: PUBLIC) {
+    repositories(first: 100, ownerAffiliations: OWNER, isFork: false, privacy: PUBLIC, orderBy: {field: PUSHED_AT, direction: DESC}) {
       totalCount
+      pageInfo {
+        endCursor
+        hasNextPage
+      }
+      nodes {
+        ...RepositoryFields
+      }
     }
     pullRequests {
       totalCount
@@ -47,10 +158,10 @@ query GetUserSummary($username: String!) {
     }
   }
 }
-"""
+""" + REPOSITORY_FIELDS_FRAGMENT
 
 GET_REPOSITORIES_QUERY = """
-query GetRepositories($username: String!, $cursor: String) {
+query GetRepositories($username: String!, $cursor: String, $authorId: ID!) {
   user(login: $username) {
     repositories(first: 100, after: $cursor, ownerAffiliations: OWNER, isFork: false, privacy: PUBLIC, orderBy: {field: PUSHED_AT, direction: DESC}) {
       pageInfo {
@@ -58,18 +169,13 @@ query GetRepositories($username: String!, $cursor: String) {
         hasNextPage
       }
       nodes {
-        name
-        owner {
-          login
-        }
-        stargazerCount
-        forkCount
-        languages(first: 10, orderBy: {field: SIZE, direction: DESC}) {
-          edges {
-            size
-            node {
-              name
-              color
+        ...RepositoryFields
+        defaultBranchRef {
+          target {
+            ... on Commit {
+              authorCommits: history(author: {id: $authorId}) {
+                totalCount
+              }
             }
           }
         }
@@ -77,15 +183,45 @@ query GetRepositories($username: String!, $cursor: String) {
     }
   }
 }
+""" + REPOSITORY_FIELDS_FRAGMENT
+
+COMMITS_BATCH_SIZE = 20
+MAX_CONCURRENT_BATCHES = 10
+
+GET_REPOSITORY_CURSORS_QUERY = """
+query GetRepositoryCursors($username: String!, $cursor: String) {
+  user(login: $username) {
+    repositories(first: 100, after: $cursor, ownerAffiliations: OWNER, isFork: false, privacy: PUBLIC, orderBy: {field: PUSHED_AT, direction: DESC}) {
+      pageInfo {
+        endCursor
+        hasNextPage
+      }
+    }
+  }
+}
 """
 
 GET_COMMITS_QUERY = """
-query GetCommits($owner: String!, $name: String!, $cursor: String, $authorId: ID!) {
-  repository(owner: $owner, name: $name) {
-    defaultBranchRef {
-      target {
-        ... on Commit {
-          history(first: 100, after: $cursor, author: {id: $authorId}) {
+query GetCommits({variables}$authorId: ID!) {{
+{repositories}
+}}
+"""
+
+REPOSITORY_COMMITS_FIELD = """
+  r{index}: repository(owner: $owner{index}, name: $name{index}) {{
+    defaultBranchRef {{
+      target {{
+        ... on Commit {{
+          history({history_arguments}author: {{id: $authorId}}) {{
+            totalCount{history_page}
+          }}
+        }}
+      }}
+    }}
+  }}
+"""
+
+COMMIT_HISTORY_PAGE_FIELDS = """
             pageInfo {
               endCursor
               hasNextPage
@@ -94,172 +230,292 @@ query GetCommits($owner: String!, $name: String!, $cursor: String, $authorId: ID
               additions
               deletions
               committedDate
-            }
-          }
-        }
-      }
-    }
-  }
-}
-"""
+            }"""
 
-def get_user_summary_stats(username, token):
-    """Fetches high-level stats for a user that are quick to retrieve."""
+@lru_cache(maxsize=None)
+def build_commits_query_text(batch_size, count_only):
+    """Builds the batched commits query text, which depends only on the batch size and mode."""
+    declarations, fields = [], []
+    for index in range(batch_size):
+        declarations.append(f"$owner{index}: String!, $name{index}: String!, ")
+        if count_only:
+            history_arguments, history_page = "", ""
+        else:
+            declarations.append(f"$cursor{index}: String, ")
+            history_arguments = f"first: 100, after: $cursor{index}, "
+            history_page = COMMIT_HISTORY_PAGE_FIELDS
+        fields.append(REPOSITORY_COMMITS_FIELD.format(
+            index=index, history_arguments=history_arguments, history_page=history_page
+        ))
+    return GET_COMMITS_QUERY.format(variables="".join(declarations), repositories="".join(fields))
+
+def build_batched_commits_query(repo_batch, cursors, count_only=False):
+    """Builds one GraphQL document fetching a page of commits, or only the commit count, for each repository in the batch."""
+    variables = {}
+    for index, ((owner, name), cursor) in enumerate(zip(repo_batch, cursors)):
+        variables[f"owner{index}"] = owner
+        variables[f"name{index}"] = name
+        if not count_only:
+            variables[f"cursor{index}"] = cursor
+    return build_commits_query_text(len(repo_batch), count_only), variables
+
+async def get_user_bootstrap(client, username):
+    """Fetches high-level stats for a user together with their first page of repositories."""
     variables = {"username": username}
-    data = graphql_request(GET_USER_SUMMARY_QUERY, variables, token)
+    data = await graphql_request(client, GET_USER_BOOTSTRAP_QUERY, variables)
     user_data = data.get("data", {}).get("user", {})
-    return {
+    repo_data = user_data.get("repositories", {})
+    summary_stats = {
         "id": user_data.get("id"),
         "createdAt": user_data.get("createdAt"),
         "followers": user_data.get("followers", {}).get("totalCount", 0),
         "following": user_data.get("following", {}).get("totalCount", 0),
-        "repos": user_data.get("repositories", {}).get("totalCount", 0),
+        "repos": repo_data.get("totalCount", 0),
         "prs": user_data.get("pullRequests", {}).get("totalCount", 0),
         "issues": user_data.get("issues", {}).get("totalCount", 0),
     }
+    return summary_stats, (repo_data.get("nodes", []), repo_data.get("pageInfo", {}))
+
+async def prefetch_cursors(client, username, total, cursor):
+    """Collects the start cursor of every repository page after the first using a query that selects only pageInfo."""
+    cursors = [cursor]
+    page_count = math.ceil(total / 100) - 1
+    while len(cursors) < page_count:
+        variables = {"username": username, "cursor": cursors[-1]}
+        data = await graphql_request(client, GET_REPOSITORY_CURSORS_QUERY, variables)
+        page_info = data.get("data", {}).get("user", {}).get("repositories", {}).get("pageInfo", {})
+        if not page_info.get("hasNextPage", False):
+            break
+        cursors.append(page_info.get("endCursor"))
+    return cursors
+
+async def get_repositories_page(client, username, author_id, cursor):
+    """Fetches a single page of repository data for a user, including the author's commit count per repository."""
+    variables = {"username": username, "cursor": cursor, "authorId": author_id}
+    data = await graphql_request(client, GET_REPOSITORIES_QUERY, variables)
+    repo_data = data.get("data", {}).get("user", {}).get("repositories", {})
+    return repo_data.get("nodes", []), repo_data.get("pageInfo", {})
 
-def get_all_repositories(username, token):
-    """Fetches all repository data for a user."""
-    repos = []
-    cursor = None
-    has_next_page = True
-    while has_next_page:
-        variables = {"username": username, "cursor": cursor}
-        data = graphql_request(GET_REPOSITORIES_QUERY, variables, token)
-        repo_data = data.get("data", {}).get("user", {}).get("repositories", {})
-        repos.extend(repo_data.get("nodes", []))
-        page_info = repo_data.get("pageInfo", {})
-        cursor = page_info.get("endCursor")
-        has_next_page = page_info.get("hasNextPage", False)
+async def get_all_repositories(client, username, author_id, total, first_page):
+    """Fetches all repository data for a user, requesting every page after the first concurrently."""
+    repos, page_info = first_page
+    repos = list(repos)
+    if not page_info.get("hasNextPage", False):
+        return repos
+
+    cursors = await prefetch_cursors(client, username, total, page_info.get("endCursor"))
+    pages = await asyncio.gather(*(get_repositories_page(client, username, author_id, cursor) for cursor in cursors))
+    repos.extend(repo for nodes, _ in pages for repo in nodes)
+
+    # The summary count can lag behind; keep paginating if more pages turned up
+    page_info = pages[-1][1]
+    while page_info.get("hasNextPage", False):
+        nodes, page_info = await get_repositories_page(client, username, author_id, page_info.get("endCursor"))
+        repos.extend(nodes)
     return repos
 
-def get_commit_stats(owner, name, token, author_id):
-    """Fetches commit statistics for a single repository, filtered by author."""
-    total_additions, total_deletions, total_commits = 0, 0, 0
-    earliest_date, latest_date = None, None
-    cursor = None
-    has_next_page = True
-    while has_next_page:
-        try:
-            variables = {"owner": owner, "name": name, "cursor": cursor, "authorId": author_id}
-            data = graphql_request(GET_COMMITS_QUERY, variables, token)
-            
-            repo = data.get("data", {}).get("repository")
+async def get_commit_stats(client, repo_batch, author_id, *, count_only=False):
+    """Fetches commit statistics for a batch of repositories, filtered by author.
+
+    With count_only, only history totalCount is selected and no pages are walked, so
+    additions, deletions and dates come back empty. Repositories whose query returned a
+    GraphQL error come back as None rather than as partial totals.
+    """
+    commit_pages = [[] for _ in repo_batch]
+    commit_counts = [0] * len(repo_batch)
+    failed = set()
+    cursors = [None] * len(repo_batch)
+    pending = list(range(len(repo_batch)))
+    while pending:
+        query, variables = build_batched_commits_query(
+            [repo_batch[i] for i in pending], [cursors[i] for i in pending], count_only
+        )
+        variables["authorId"] = author_id
+        data = await graphql_request(client, query, variables)
+        results = data.get("data") or {}
+        errors = data.get("errors") or []
+        if any(not error.get("path") for error in errors):
+            raise RuntimeError(errors[0].get("message", "GraphQL request failed"))
+        failed_aliases = {error["path"][0] for error in errors}
+
+        still_pending = []
+        for alias_index, i in enumerate(pending):
+            if f"r{alias_index}" in failed_aliases:
+                failed.add(i)
+                continue
+            repo = results.get(f"r{alias_index}")
             if not repo or not repo.get("defaultBranchRef") or not repo["defaultBranchRef"].get("target"):
-                break 
-                
+                continue
+
             history = repo["defaultBranchRef"]["target"]["history"]
+            total_count = history.get("totalCount", 0)
+            if count_only:
+                commit_counts[i] = total_count
+                continue
+
             commits = history.get("nodes", [])
-            if not commits:
-                break
-
-            total_commits += len(commits)
-            
-            for commit in commits:
-                total_additions += commit.get("additions", 0)
-                total_deletions += commit.get("deletions", 0)
-                commit_date = datetime.fromisoformat(commit["committedDate"].replace("Z", "+00:00"))
-                
-                if earliest_date is None or commit_date < earliest_date:
-                    earliest_date = commit_date
-                if latest_date is None or commit_date > latest_date:
-                    latest_date = commit_date
+            if total_count == 0 or not commits:
+                continue
+
+            commit_counts[i] += len(commits)
+            additions = np.fromiter((c.get("additions", 0) for c in commits), dtype=np.int64, count=len(commits))
+            deletions = np.fromiter((c.get("deletions", 0) for c in commits), dtype=np.int64, count=len(commits))
+            # committedDate is always UTC ("...Z"); strip the suffix so NumPy parses it as naive seconds
+            dates = np.array([c["committedDate"][:-1] for c in commits], dtype="datetime64[s]")
+            commit_pages[i].append((additions, deletions, dates.astype(np.int64)))
 
             page_info = history.get("pageInfo", {})
-            cursor = page_info.get("endCursor")
-            has_next_page = page_info.get("hasNextPage", False)
-        except Exception:
-            # Ignore errors for single repo analysis (e.g., empty repo)
-            has_next_page = False
-        
-    return total_additions, total_deletions, total_commits, earliest_date, latest_date
-
-def main():
-    """Main function to run the script."""
-    console = Console()
-    console.print(Panel("[bold cyan]GitHub User Stats[/bold cyan]", expand=False, border_style="blue"))
+            if commit_counts[i] < total_count and page_info.get("hasNextPage", False):
+                cursors[i] = page_info.get("endCursor")
+                still_pending.append(i)
+        pending = still_pending
 
-    username = os.getenv("GITHUB_USERNAME")
-    if not username:
-        username = console.input("Enter your GitHub username: ")
+    stats = []
+    for i, pages in enumerate(commit_pages):
+        if i in failed:
+            stats.append(None)
+        elif not pages:
+            stats.append((0, 0, commit_counts[i], None, None))
+        else:
+            additions, deletions, epochs = (np.concatenate(column) for column in zip(*pages))
+            stats.append((
+                int(additions.sum()),
+                int(deletions.sum()),
+                commit_counts[i],
+                datetime.fromtimestamp(int(epochs.min()), tz=timezone.utc),
+                datetime.fromtimestamp(int(epochs.max()), tz=timezone.utc),
+            ))
+    return stats
 
-    token = os.getenv("GITHUB_TOKEN")
-    if not token:
-        console.print("[yellow]Note: A GitHub Personal Access Token is required to avoid rate limiting and access private repository data.[/yellow]")
-        token = getpass.getpass("Enter your GitHub Personal Access Token: ")
+def get_commit_stats_cache_key(repo, author_id):
+    """Returns the cache key for a repository's commit stats, or None if it has no default branch."""
+    target = (repo.get("defaultBranchRef") or {}).get("target") or {}
+    oid = target.get("oid")
+    if not oid:
+        return None
+    return f"v{COMMIT_STATS_CACHE_VERSION}:{repo['owner']['login']}/{repo['name']}@{oid}:{author_id}"
 
-    try:
-        with console.status("[bold green]Fetching quick summary stats...[/]"):
-            summary_stats = get_user_summary_stats(username, token)
-            author_id = summary_stats.get("id")
-
-        created_at_str = summary_stats.get("createdAt")
-        created_at_dt = datetime.fromisoformat(created_at_str.replace("Z", "+00:00"))
-        time_on_github = datetime.now(timezone.utc) - created_at_dt
-        
-        console.print("\n[cyan]Now starting detailed analysis (this may take a while)...[/cyan]")
-
-        with console.status("[bold green]Fetching repositories & languages...[/]"):
-            repositories = get_all_repositories(username, token)
-        console.print(f"[green]Found {len(repositories)} public repositories to analyze.[/green]")
-        
-        language_stats = {}
-        total_lang_size = 0
-        for repo in repositories:
-            if not repo or not repo.get('languages'): continue
-            for lang_edge in repo['languages']['edges']:
-                node = lang_edge['node']
-                if not node: continue
-                lang_name = node['name']
-                lang_color = node.get('color', 'white')
-                lang_size = lang_edge['size']
-                total_lang_size += lang_size
-                if lang_name in language_stats:
-                    language_stats[lang_name]['size'] += lang_size
-                else:
-                    language_stats[lang_name] = {'size': lang_size, 'color': lang_color}
-        
-        most_popular_repo = max(repositories, key=lambda r: r['stargazerCount']) if repositories else None
-
-        total_additions, total_deletions, total_commits = 0, 0, 0
-        first_commit_date, latest_commit_date = None, None
-        
-        owners = [repo["owner"]["login"] for repo in repositories]
-        names = [repo["name"] for repo in repositories]
-
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            results = executor.map(get_commit_stats, owners, names, repeat(token), repeat(author_id))
-            
-            for result in track(results, console=console, total=len(repositories), description="[cyan]Analyzing your commits...    "):
-                add, dele, com, earliest, latest = result
-                total_additions += add
-                total_deletions += dele
-                total_commits += com
-
-                if earliest and (first_commit_date is None or earliest < first_commit_date):
-                    first_commit_date = earliest
-                if latest and (latest_commit_date is None or latest > latest_commit_date):
-                    latest_commit_date = latest
-
-        # Display Language Stats
-        sorted_languages = sorted(language_stats.items(), key=lambda item: item[1]['size'], reverse=True)
-        lang_text_parts = []
-        if sorted_languages:
-            for lang, data in sorted_languages[:7]: # Show top 7
-                percentage = (data['size'] / total_lang_size) * 100 if total_lang_size > 0 else 0
-                lang_text_parts.append(Text(f"● {lang}: {percentage:.2f}%\n", style=data['color']))
-            console.print(Panel(Text.assemble(*lang_text_parts), title="[bold]Language Breakdown[/bold]", border_style="magenta"))
-
-        # Display Detailed Code Stats
-        coding_lifespan = latest_commit_date - first_commit_date if first_commit_date and latest_commit_date else None
-        
-        detailed_text_parts = []
-        if most_popular_repo:
-            detailed_text_parts.extend([
-                Text("Most Popular Repo:", style="bold"),
-                f" {most_popular_repo['name']} (⭐️ {most_popular_repo['stargazerCount']} / 🔱 {most_popular_repo['forkCount']})\n"
-            ])
+async def run_analysis(console, client, cache, username, mode):
+    """Fetches all stats for a user and renders them to the console."""
+    with console.status("[bold green]Fetching quick summary stats...[/]"):
+        summary_stats, first_repo_page = await get_user_bootstrap(client, username)
+        author_id = summary_stats.get("id")
+
+    created_at_str = summary_stats.get("createdAt")
+    created_at_dt = datetime.fromisoformat(created_at_str.replace("Z", "+00:00"))
+    time_on_github = datetime.now(timezone.utc) - created_at_dt
+    
+    console.print("\n[cyan]Now starting detailed analysis (this may take a while)...[/cyan]")
+
+    with console.status("[bold green]Fetching repositories & languages...[/]"):
+        repositories = await get_all_repositories(client, username, author_id, summary_stats["repos"], first_repo_page)
+    console.print(f"[green]Found {len(repositories)} public repositories to analyze.[/green]")
+    
+    # Summary mode only needs commit counts, which come back in a single request per batch
+    count_only = mode == "summary"
+
+    # Single pass over the repositories: languages, most popular repo and cached commit stats
+    lang_sizes = Counter()
+    lang_colors = {}
+    most_popular_repo = None
+    results, uncached_repos = [], []
+    for repo in repositories:
+        if not repo: continue
+        for lang_edge in (repo.get('languages') or {}).get('edges', ()):
+            node = lang_edge['node']
+            if not node: continue
+            lang_sizes[node['name']] += lang_edge['size']
+            lang_colors.setdefault(node['name'], node.get('color', 'white'))
+
+        if most_popular_repo is None or repo['stargazerCount'] > most_popular_repo['stargazerCount']:
+            most_popular_repo = repo
+
+        # Skip empty repositories, and ones already known to have no commits by the author.
+        # authorCommits is only present from the second page on: the first page comes from the
+        # bootstrap query, which runs before the author id is known. For users with 100 or fewer
+        # repositories only empty repositories are skipped here; the rest are resolved by the
+        # totalCount check on the first round of get_commit_stats.
+        target = (repo.get("defaultBranchRef") or {}).get("target")
+        author_commits = (target or {}).get("authorCommits")
+        if not target or (author_commits or {}).get("totalCount") == 0:
+            continue
+
+        # Summary mode only needs the count, which this page already carries
+        if count_only and author_commits is not None:
+            results.append((0, 0, author_commits.get("totalCount", 0), None, None))
+            continue
+
+        # Default branch history below HEAD is immutable, so stats keyed by the head oid can be reused
+        cache_key = get_commit_stats_cache_key(repo, author_id)
+        cached = cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            results.append(cached)
+        else:
+            uncached_repos.append(((repo["owner"]["login"], repo["name"]), cache_key))
+    total_lang_size = sum(lang_sizes.values())
+
+    uncached_iter = iter(uncached_repos)
+    batches = list(iter(lambda: list(islice(uncached_iter, COMMITS_BATCH_SIZE)), []))
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+
+    async def fetch_batch(batch):
+        async with semaphore:
+            repo_batch = [repo_key for repo_key, _ in batch]
+            return batch, await get_commit_stats(client, repo_batch, author_id, count_only=count_only)
+
+    # Consume batches in completion order so one large repository does not hold up the progress bar
+    failed_repos = []
+    with Progress(console=console) as progress:
+        task = progress.add_task("[cyan]Analyzing your commits...    ", total=len(results) + len(uncached_repos), completed=len(results))
+        for next_batch in asyncio.as_completed([fetch_batch(batch) for batch in batches]):
+            batch, batch_stats = await next_batch
+            for (repo_key, cache_key), result in zip(batch, batch_stats):
+                # Only results free of errors for their alias may be cached: the key stays valid until the next push
+                if result is None:
+                    failed_repos.append(repo_key)
+                    continue
+                if cache_key and mode == "full":
+                    cache.set(cache_key, result)
+                results.append(result)
+            progress.advance(task, len(batch))
+
+    if failed_repos:
+        failed_names = ", ".join(f"{owner}/{name}" for owner, name in failed_repos)
+        console.print(f"[yellow]Warning: GitHub returned errors for {len(failed_repos)} repositories; their commits are not included in the totals: {failed_names}[/yellow]")
 
+    total_additions, total_deletions, total_commits = 0, 0, 0
+    first_commit_date, latest_commit_date = None, None
+    for add, dele, com, earliest, latest in results:
+        total_additions += add
+        total_deletions += dele
+        total_commits += com
+
+        if earliest and (first_commit_date is None or earliest < first_commit_date):
+            first_commit_date = earliest
+        if latest and (latest_commit_date is None or latest > latest_commit_date):
+            latest_commit_date = latest
+
+    # Display Language Stats
+    top_languages = lang_sizes.most_common(7) # Show top 7
+    lang_text_parts = []
+    if top_languages:
+        for lang, size in top_languages:
+            percentage = (size / total_lang_size) * 100 if total_lang_size > 0 else 0
+            lang_text_parts.append(Text(f"● {lang}: {percentage:.2f}%\n", style=lang_colors[lang]))
+        console.print(Panel(Text.assemble(*lang_text_parts), title="[bold]Language Breakdown[/bold]", border_style="magenta"))
+
+    # Display Detailed Code Stats
+    coding_lifespan = latest_commit_date - first_commit_date if first_commit_date and latest_commit_date else None
+    
+    detailed_text_parts = []
+    if most_popular_repo:
+        detailed_text_parts.extend([
+            Text("Most Popular Repo:", style="bold"),
+            f" {most_popular_repo['name']} (⭐️ {most_popular_repo['stargazerCount']} / 🔱 {most_popular_repo['forkCount']})\n"
+        ])
+
+    if mode == "full":
         detailed_text_parts.extend([
             Text(f"First Commit: {first_commit_date.strftime('%B %d, %Y') if first_commit_date else 'N/A'}", style="bold"),
             "\n",
@@ -269,31 +525,66 @@ def main():
         if coding_lifespan and coding_lifespan.days > 0:
             detailed_text_parts.append(f"Coding Lifespan: {coding_lifespan.days // 365} years, {(coding_lifespan.days % 365) // 30} months\n")
 
+    detailed_text_parts.append(Text(f"Your Total Commits: {total_commits}", style="bold yellow"))
+    if mode == "full":
         detailed_text_parts.extend([
-            Text(f"Your Total Commits: {total_commits}", style="bold yellow"),
             "\n",
             Text(f"Your Total Lines Added: {total_additions}", style="bold green"),
             "\n",
             Text(f"Your Total Lines Deleted: {total_deletions}", style="bold red"),
         ])
-        
-        console.print(Panel(Text.assemble(*detailed_text_parts), title="[bold]Detailed Code Stats[/bold]", border_style="blue"))
-
-        # Display Quick Summary Stats (now at the end)
-        summary_text = Text.assemble(
-            Text(f"User Since: {created_at_dt.strftime('%B %d, %Y')}", style="bold bright_blue"),
-            f" (~{time_on_github.days // 365} years, { (time_on_github.days % 365) // 30} months)\n",
-            Text(f"Followers: {summary_stats['followers']}", style="bold bright_magenta"), " | ",
-            Text(f"Following: {summary_stats['following']}\n", style="bold bright_magenta"),
-            Text(f"Total Public Repositories: {summary_stats['repos']}", style="bold bright_yellow"),
-            "\n",
-            Text(f"Total Pull Requests: {summary_stats['prs']}", style="bold bright_cyan"),
-            "\n",
-            Text(f"Total Issues: {summary_stats['issues']}", style="bold bright_red"),
-        )
-        console.print(Panel(summary_text, title="[bold]Quick Summary[/bold]", border_style="green"))
+    
+    console.print(Panel(Text.assemble(*detailed_text_parts), title="[bold]Detailed Code Stats[/bold]", border_style="blue"))
+
+    # Display Quick Summary Stats (now at the end)
+    summary_text = Text.assemble(
+        Text(f"User Since: {created_at_dt.strftime('%B %d, %Y')}", style="bold bright_blue"),
+        f" (~{time_on_github.days // 365} years, { (time_on_github.days % 365) // 30} months)\n",
+        Text(f"Followers: {summary_stats['followers']}", style="bold bright_magenta"), " | ",
+        Text(f"Following: {summary_stats['following']}\n", style="bold bright_magenta"),
+        Text(f"Total Public Repositories: {summary_stats['repos']}", style="bold bright_yellow"),
+        "\n",
+        Text(f"Total Pull Requests: {summary_stats['prs']}", style="bold bright_cyan"),
+        "\n",
+        Text(f"Total Issues: {summary_stats['issues']}", style="bold bright_red"),
+    )
+    console.print(Panel(summary_text, title="[bold]Quick Summary[/bold]", border_style="green"))
+
+async def main():
+    """Main function to run the script."""
+    parser = argparse.ArgumentParser(description="Show GitHub stats for a user.")
+    parser.add_argument(
+        "--mode",
+        choices=("summary", "full"),
+        default="full",
+        help="'summary' only counts commits; 'full' also totals lines added/deleted and commit dates",
+    )
+    args = parser.parse_args()
 
-    except requests.exceptions.HTTPError as e:
+    console = Console()
+    console.print(Panel("[bold cyan]GitHub User Stats[/bold cyan]", expand=False, border_style="blue"))
+
+    username = os.getenv("GITHUB_USERNAME")
+    if not username:
+        username = console.input("Enter your GitHub username: ")
+
+    token = os.getenv("GITHUB_TOKEN")
+    if not token:
+        console.print("[yellow]Note: A GitHub Personal Access Token is required to avoid rate limiting and access private repository data.[/yellow]")
+        token = getpass.getpass("Enter your GitHub Personal Access Token: ")
+
+    try:
+        with diskcache.Cache(COMMIT_STATS_CACHE_DIR) as cache:
+            async with httpx.AsyncClient(
+                http2=True,
+                headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+                # Keep enough idle connections alive that concurrent batches reuse sockets instead of reconnecting
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                timeout=60.0,
+                event_hooks=build_rate_limit_hooks(console),
+            ) as client:
+                await run_analysis(console, client, cache, username, args.mode)
+    except httpx.HTTPStatusError as e:
         console.print(f"[bold red]Error:[/bold red] Failed to fetch data from GitHub. Status code: {e.response.status_code}")
         if e.response.status_code == 401:
             console.print("[yellow]Please check that your Personal Access Token is correct and has the necessary 'repo' scopes.[/yellow]")
@@ -301,4 +592,10 @@ def main():
         console.print(f"[bold red]An unexpected error occurred:[/bold red] {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        import uvloop
+    except ImportError:
+        # uvloop does not support Windows; fall back to the default asyncio loop there
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file